@@ -2,11 +2,35 @@ from __future__ import annotations
 
 from typing import Any
 
+# Normalized moods live on the host instance: they depend on that host's mood set, and a
+# module-level cache would keep every host alive. Deleting the attribute resets it.
+HOST_CACHE_ATTR = "_chat_mood_cache"
+MOOD_CACHE_MAX = 256
+
+
+def _normalize_mood(host: Any, requested: str, fallback: str) -> str:
+  cache = getattr(host, HOST_CACHE_ATTR, None)
+  if not isinstance(cache, dict):
+    cache = {}
+    try:
+      setattr(host, HOST_CACHE_ATTR, cache)
+    except (AttributeError, TypeError):
+      return host.normalize_mood(requested, fallback)
+  cache_key = (requested, fallback)
+  mood = cache.get(cache_key)
+  if mood is None:
+    mood = host.normalize_mood(requested, fallback)
+    if len(cache) >= MOOD_CACHE_MAX:
+      cache.clear()
+    cache[cache_key] = mood
+  return mood
+
 
 def handle(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
-  requested_mood = str((args or {}).get("mood") or getattr(runtime, "mood", "") or "").strip()
-  fallback_mood = str(getattr(runtime, "mood", "") or "neutral").strip() or "neutral"
+  runtime_mood = str(getattr(runtime, "mood", "") or "").strip()
+  requested_mood = str((args or {}).get("mood") or "").strip() or runtime_mood
+  fallback_mood = runtime_mood or "neutral"
   chat_id = str(getattr(runtime, "chat_id", "") or "").strip() or "default"
-  mood = host.normalize_mood(requested_mood, fallback_mood)
+  mood = _normalize_mood(host, requested_mood, fallback_mood)
   host.update_chat_mood(chat_id=chat_id, mood=mood)
   return {"chat_id": chat_id, "mood": mood}
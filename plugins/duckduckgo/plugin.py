@@ -1,22 +1,83 @@
 from __future__ import annotations
 
 import html as html_lib
+import itertools
 import re
-from typing import Any
+from functools import lru_cache
+from typing import Any, Iterator
 from urllib import parse as url_parse
 
+try:
+  from selectolax.parser import HTMLParser
+except ImportError:
+  # selectolax 1.0 dropped the Modest backend; Lexbor has the same node API.
+  try:
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+  except ImportError:
+    HTMLParser = None
+
+_DDG_BASE = "https://duckduckgo.com/html/?"
+# Results sit near the top of the page; the tail is never scanned.
+MAX_HTML_CHARS = 200_000
+_CLASS_RE = re.compile(r'\sclass="[^"]*result__a', re.IGNORECASE)
+_HREF_RE = re.compile(r'\shref="([^"]+)"', re.IGNORECASE)
+_CLASS_RE_B = re.compile(rb'\sclass="[^"]*result__a', re.IGNORECASE)
+_HREF_RE_B = re.compile(rb'\shref="([^"]+)"', re.IGNORECASE)
+# ASCII-only lowering keeps offsets aligned; str.lower() can change length (e.g. "İ").
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Entities DuckDuckGo actually emits; "&amp;" goes last so "&amp;lt;" does not double-decode.
+_ENT: dict[str, str] = {
+  "&lt;": "<",
+  "&gt;": ">",
+  "&quot;": '"',
+  "&#39;": "'",
+  "&#x27;": "'",
+  "&nbsp;": "\xa0",
+  "&amp;": "&",
+}
+
+
+@lru_cache(maxsize=1024)
+def _cached_urlparse(url: str) -> url_parse.ParseResult:
+  return url_parse.urlparse(url)
+
+
+def _fast_unescape(s: str) -> str:
+  if "&" not in s:
+    return s
+  if s.count("&") != sum(s.count(entity) for entity in _ENT):
+    return html_lib.unescape(s)
+  for entity, char in _ENT.items():
+    s = s.replace(entity, char)
+  return s
+
 
 def _strip_html_tags(fragment: str) -> str:
-  without_tags = re.sub(r"<[^>]+>", " ", str(fragment or ""), flags=re.DOTALL)
-  return re.sub(r"\s+", " ", html_lib.unescape(without_tags)).strip()
+  s = str(fragment or "")
+  if "<" not in s and "&" not in s:
+    return " ".join(s.split())
+  parts: list[str] = []
+  i = 0
+  while (lt := s.find("<", i)) != -1:
+    parts.append(s[i:lt])
+    parts.append(" ")
+    gt = s.find(">", lt + 1)
+    if gt == -1:
+      i = len(s)
+      break
+    i = gt + 1
+  parts.append(s[i:])
+  return " ".join(_fast_unescape("".join(parts)).split())
 
 
 def _decode_duckduckgo_result_url(url_like: str) -> str:
-  raw = html_lib.unescape(str(url_like or "").strip())
+  # Expects an entity-decoded href, as _iter_result_anchors yields them.
+  raw = str(url_like or "").strip()
   if not raw:
     return ""
 
-  parsed = url_parse.urlparse(raw)
+  parsed = _cached_urlparse(raw)
   query = url_parse.parse_qs(parsed.query)
   uddg = query.get("uddg", [])
   if uddg:
@@ -31,36 +92,80 @@ def _decode_duckduckgo_result_url(url_like: str) -> str:
   return raw
 
 
-def _parse_duckduckgo_results(html: str, *, limit: int = 5) -> list[dict[str, str]]:
-  results: list[dict[str, str]] = []
-  seen: set[str] = set()
+def _as_text(value: str | bytes) -> str:
+  if isinstance(value, bytes):
+    return value.decode("utf-8", "replace")
+  return value
 
-  pattern = re.compile(
-    r'<a[^>]+class="[^"]*result__a[^"]*"[^>]+href="([^"]+)"[^>]*>(.*?)</a>',
-    flags=re.IGNORECASE | re.DOTALL,
-  )
-  for match in pattern.finditer(str(html or "")):
-    href = _decode_duckduckgo_result_url(match.group(1))
-    title = _strip_html_tags(match.group(2))
-    if not href or not title:
+
+def _iter_result_anchors(html: str | bytes) -> Iterator[tuple[str, str]]:
+  # Yields (href, title) with entities already decoded on both paths; the parser decodes
+  # attributes itself, so only the find walk unescapes.
+  if HTMLParser is not None:
+    for node in HTMLParser(html).css("a.result__a"):
+      href = node.attributes.get("href")
+      if href:
+        yield href, " ".join(node.text(separator=" ").split())
+    return
+
+  # Linear find walk: locate the result__a literal, back up to its <a tag, then find </a>.
+  # Avoids regex backtracking on unterminated tags; raw bytes are scanned as-is and only
+  # the matched slices get decoded. Tags match case-insensitively, like the regexes, by
+  # finding offsets in an ASCII-lowered copy and slicing the original.
+  if isinstance(html, bytes):
+    open_tag, gt_char, close_tag, marker = b"<a", b">", b"</a>", b"result__a"
+    class_re, href_re = _CLASS_RE_B, _HREF_RE_B
+    folded = html.lower()
+  else:
+    open_tag, gt_char, close_tag, marker = "<a", ">", "</a>", "result__a"
+    class_re, href_re = _CLASS_RE, _HREF_RE
+    folded = html.translate(_ASCII_LOWER)
+  idx = 0
+  while (hit := folded.find(marker, idx)) != -1:
+    idx = hit + len(marker)
+    start = folded.rfind(open_tag, max(0, hit - 512), hit)
+    if start == -1 or not html[start + 2: start + 3].isspace():
       continue
-    parsed = url_parse.urlparse(href)
-    if parsed.scheme not in {"http", "https"} or not parsed.netloc:
+    gt = folded.find(gt_char, start)
+    if gt == -1:
+      return
+    if gt < hit or not class_re.search(html, start, gt):
       continue
-    normalized = parsed.geturl()
-    if normalized in seen:
+    href_match = href_re.search(html, start, gt)
+    if not href_match:
       continue
-    seen.add(normalized)
-    results.append(
-      {
-        "title": title,
-        "url": normalized,
-      }
-    )
-    if len(results) >= max(1, limit):
-      break
+    end = folded.find(close_tag, gt)
+    if end == -1:
+      return
+    href = _fast_unescape(_as_text(href_match.group(1)).strip())
+    yield href, _strip_html_tags(_as_text(html[gt + 1: end]))
+    idx = end + 4
 
-  return results
+
+def _iter_duckduckgo_results(html: str | bytes) -> Iterator[tuple[str, str]]:
+  if not isinstance(html, bytes):
+    html = str(html or "")
+  seen: set[str] = set()
+  for raw_href, title in _iter_result_anchors(html[:MAX_HTML_CHARS]):
+    href = _decode_duckduckgo_result_url(raw_href)
+    if not href or not title:
+      continue
+    # Schemes are case-insensitive; lower only the scheme, as urlparse().geturl() did.
+    prefix = href[:8].lower()
+    if prefix == "https://":
+      host_start = 8
+    elif prefix.startswith("http://"):
+      host_start = 7
+    else:
+      continue
+    if not href.startswith(prefix[:host_start]):
+      href = prefix[:host_start] + href[host_start:]
+    if host_start >= len(href) or href[host_start] in "/?#":
+      continue
+    if href in seen:
+      continue
+    seen.add(href)
+    yield href, title
 
 
 def handle(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
@@ -69,14 +174,21 @@ def handle(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
   if not query:
     raise ValueError("query is required")
   host.ensure_network_allowed()
-  try:
-    limit = int(payload.get("limit") or 5)
-  except (TypeError, ValueError):
-    limit = 5
+  limit = payload.get("limit") or 5
+  if not isinstance(limit, int):
+    try:
+      limit = int(limit)
+    except (TypeError, ValueError, OverflowError):
+      limit = 5
   safe_limit = max(1, min(10, limit))
-  search_url = "https://duckduckgo.com/html/?q=" + url_parse.quote_plus(query)
+  search_url = _DDG_BASE + url_parse.urlencode({"q": query})
   web_payload = host.fetch_web_url(search_url)
-  results = _parse_duckduckgo_results(web_payload.get("text", ""), limit=safe_limit)
+  body = web_payload.get("body")
+  source = bytes(body) if isinstance(body, (bytes, bytearray)) else web_payload.get("text", "")
+  results = [
+    {"title": title, "url": url}
+    for url, title in itertools.islice(_iter_duckduckgo_results(source), safe_limit)
+  ]
   return {
     "query": query,
     "count": len(results),
@@ -1,16 +1,43 @@
 from __future__ import annotations
 
+import bisect
 import datetime as dt
+import heapq
 import json
 import math
 import re
 import sqlite3
+import sys
 import uuid
+import zlib
+from collections import Counter
 from difflib import SequenceMatcher
-from typing import Any
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+# rapidfuzz only prunes: its ratio bounds difflib's from above, and scores stay difflib's.
+try:
+  from rapidfuzz import fuzz as _rf_fuzz
+  from rapidfuzz import process as _rf_process
+except ImportError:
+  _rf_fuzz = None
+  _rf_process = None
+
+try:
+  import numpy as _np
+except ImportError:
+  _np = None
+
+try:
+  import ahocorasick as _ahocorasick
+except ImportError:
+  _ahocorasick = None
 
 STORAGE_KEY = "plugin.user-memory.entries.v1"
 SQLITE_MIGRATION_FLAG_KEY = "plugin.user-memory.sqlite_migrated.v2"
+# Bumped on every save; lets each host reuse its loaded entries until another write lands.
+ENTRIES_VERSION_KEY = f"{STORAGE_KEY}.ver"
+HOST_CACHE_ATTR = "_user_memory_cache"
 
 SQL_TABLE = "plugin_user_memory_entries"
 SQL_FTS_TABLE = "plugin_user_memory_entries_fts"
@@ -22,41 +49,52 @@ MAX_KEY_LEN = 72
 MAX_TAGS = 12
 MAX_TAG_LEN = 32
 MAX_VECTOR_TERMS = 220
+FUZZY_CACHE_MAX = 4096
+FUZZY_BATCH_MIN = 64
+_RATIO_BOUND_SLACK = 1e-9
+_SPARSE_GRAM_BIT = 1 << 32
 
 _SQLITE_SCHEMA_READY = False
 _SQLITE_FTS_ENABLED = False
 _SQLITE_UNAVAILABLE = False
+# (id, updated_at, key, fact, tags) -> (lexical_blob, semantic_json); FIFO-bounded.
+_BLOB_CACHE: dict[tuple[Any, ...], tuple[str, str]] = {}
+# (query, target) -> fuzzy ratio; FIFO-bounded.
+_FUZZY_CACHE: dict[tuple[str, str], float] = {}
+# Single-slot inverted index over entry sparse vectors as one immutable
+# (signature, postings, ids, norms) tuple, swapped whole; see _sparse_index.
+_SPARSE_INDEX_CACHE: tuple[Any, ...] | None = None
 
 # Cross-lingual synonym groups used for hybrid recall.
-_QUERY_SYNONYM_GROUPS: list[set[str]] = [
-  {
+_QUERY_SYNONYM_GROUPS: list[tuple[str, ...]] = [
+  (
     "phone", "smartphone", "mobile", "cellphone", "iphone", "android",
     "телефон", "смартфон", "мобильник", "сотовый", "айфон", "андроид",
-  },
-  {
+  ),
+  (
     "device", "gadget", "hardware",
     "устройство", "девайс", "гаджет",
-  },
-  {
+  ),
+  (
     "name", "fullname", "nickname",
     "имя", "фио", "ник", "никнейм",
-  },
-  {
+  ),
+  (
     "city", "town", "location",
     "город", "локация", "место",
-  },
-  {
+  ),
+  (
     "profession", "job", "role", "developer", "engineer", "programmer",
     "профессия", "работа", "роль", "разработчик", "инженер", "программист",
-  },
-  {
+  ),
+  (
     "email", "mail",
     "почта", "емейл", "email",
-  },
-  {
+  ),
+  (
     "timezone", "time-zone",
     "часовой", "пояс", "таймзона",
-  },
+  ),
 ]
 
 _KEY_ALIAS_RAW: dict[str, str] = {
@@ -142,6 +180,9 @@ _GENERIC_RECALL_PATTERNS: tuple[str, ...] = (
   r"\bwhat\s+do\s+you\s+know\s+about\s+me\b",
 )
 
+# Every generic recall pattern contains one of these; without them the regexes cannot match.
+_RECALL_ANCHORS: tuple[str, ...] = ("помни", "знаешь", "remember", "know")
+
 _GENERIC_LIST_PATTERNS: tuple[str, ...] = (
   r"\bчто\s+ты\s+запомнил\w*\b",
   r"\bпокажи\s+(всю|все|всё)\s+памят\w*\b",
@@ -289,13 +330,29 @@ _CYRILLIC_TO_LATIN: dict[str, str] = {
   "я": "ya",
 }
 
+_RE_WS = re.compile(r"\s+")
+_RE_TOKEN_CLEAN = re.compile(r"[^\w.\-]+", re.UNICODE)
+_RE_WORDS = re.compile(r"[^\W_]{2,}", re.UNICODE)
+# On ASCII input _RE_WORDS matches runs of [a-z0-9]; blanking everything else lets str.split do the same.
+_ASCII_DELIM = str.maketrans({chr(code): " " for code in range(128) if not chr(code).isalnum()})
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9]+", re.IGNORECASE)
+_RE_FTS_CLEAN = re.compile(r"[^a-zа-я0-9_\-]+", re.IGNORECASE)
+_GENERIC_RECALL_RE: list[re.Pattern[str]] = [re.compile(p, re.IGNORECASE) for p in _GENERIC_RECALL_PATTERNS]
+_GENERIC_LIST_RE: list[re.Pattern[str]] = [re.compile(p, re.IGNORECASE) for p in _GENERIC_LIST_PATTERNS]
+# One alternation per slot; slots stay separate so rule order keeps deciding the winner.
+_SLOT_HINT_RE: list[tuple[str, re.Pattern[str], tuple[str, ...]]] = [
+  (slot_key, re.compile("|".join(f"(?:{p})" for p in pattern_list), re.IGNORECASE), tags)
+  for slot_key, pattern_list, tags in _SLOT_HINT_RULES
+]
+_CYRILLIC_TRANS = str.maketrans(_CYRILLIC_TO_LATIN)
+
 
 def _now_utc_iso() -> str:
   return dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds")
 
 
 def _normalize_text(value: Any, *, max_len: int = 0) -> str:
-  text = re.sub(r"\s+", " ", str(value or "")).strip()
+  text = _RE_WS.sub(" ", str(value or "")).strip()
   if max_len > 0 and len(text) > max_len:
     text = text[:max_len].rstrip()
   return text
@@ -305,12 +362,13 @@ def _normalize_token(value: Any, *, max_len: int) -> str:
   text = _normalize_text(value, max_len=max(24, max_len * 3)).lower()
   if not text:
     return ""
-  text = re.sub(r"\s+", "-", text)
-  text = re.sub(r"[^\w.\-]+", "", text, flags=re.UNICODE)
+  text = _RE_WS.sub("-", text)
+  text = _RE_TOKEN_CLEAN.sub("", text)
   text = text.strip("._-")
   if len(text) > max_len:
     text = text[:max_len].rstrip("._-")
-  return text
+  # Keys and tags repeat across every entry; interned copies share one object and compare by identity first.
+  return sys.intern(text)
 
 
 def _normalize_term(value: Any) -> str:
@@ -320,37 +378,50 @@ def _normalize_term(value: Any) -> str:
   return _normalize_text(value, max_len=48).lower()
 
 
-def _build_synonym_aliases() -> dict[str, set[str]]:
-  aliases: dict[str, set[str]] = {}
+def _fast_token(value: Any, *, max_len: int) -> str:
+  # Already-clean single words (tokenizer output, most tags) need no regex passes.
+  if isinstance(value, str):
+    text = value.lower()
+    if text.isalnum():
+      return sys.intern(text[:max_len])
+  return _normalize_token(value, max_len=max_len)
+
+
+def _fast_term(value: Any) -> str:
+  if isinstance(value, str):
+    text = value.lower()
+    if text.isalnum():
+      return text[:48]
+  return _normalize_term(value)
+
+
+def _build_synonym_aliases() -> dict[str, tuple[str, ...]]:
+  aliases: dict[str, tuple[str, ...]] = {}
   for group in _QUERY_SYNONYM_GROUPS:
-    normalized_group: set[str] = set()
-    for item in group:
-      safe_item = _normalize_term(item)
-      if safe_item:
-        normalized_group.add(safe_item)
+    # Sorted once here, so expansion order is stable without a sort per query term.
+    normalized_group = tuple(sorted({safe_item for item in group if (safe_item := _normalize_term(item))}))
     for item in normalized_group:
-      aliases[item] = set(normalized_group)
+      aliases[item] = normalized_group
   return aliases
 
 
+_EMPTY: tuple[str, ...] = ()
 _QUERY_SYNONYM_ALIASES = _build_synonym_aliases()
 _KEY_ALIAS_MAP = {
   _normalize_term(raw_key): _normalize_term(raw_value)
   for raw_key, raw_value in _KEY_ALIAS_RAW.items()
 }
-_KNOWN_INFER_KEYS: set[str] = {
-  _normalize_term(value)
-  for value in _DEFAULT_TAGS_BY_KEY.keys()
+# Flat alias/known-key -> canonical key map, so key inference is one lookup per term.
+_INFER_KEY_MAP: dict[str, str] = {
+  _normalize_term(value): _normalize_term(value)
+  for value in [*_DEFAULT_TAGS_BY_KEY.keys(), *_KEY_ALIAS_MAP.values()]
 }
-_KNOWN_INFER_KEYS.update(
-  _normalize_term(value)
-  for value in _KEY_ALIAS_MAP.values()
-)
-_KNOWN_INFER_KEYS.discard("")
+_INFER_KEY_MAP.update(_KEY_ALIAS_MAP)
+_INFER_KEY_MAP.pop("", None)
 
 
 def _canonicalize_key(value: Any) -> str:
-  token = _normalize_token(value, max_len=MAX_KEY_LEN)
+  token = _fast_token(value, max_len=MAX_KEY_LEN)
   if not token:
     return ""
   return _KEY_ALIAS_MAP.get(token, token)
@@ -362,11 +433,11 @@ def _normalize_tags(value: Any) -> list[str]:
   tags: list[str] = []
   seen: set[str] = set()
   for raw in value[: MAX_TAGS * 4]:
-    tag = _normalize_term(raw)
+    tag = _fast_term(raw)
     if not tag:
       continue
     canonical = _KEY_ALIAS_MAP.get(tag, tag)
-    canonical = _normalize_token(canonical, max_len=MAX_TAG_LEN)
+    canonical = _fast_token(canonical, max_len=MAX_TAG_LEN)
     if not canonical or canonical in seen:
       continue
     seen.add(canonical)
@@ -381,10 +452,10 @@ def _merge_tags(left: list[str], right: list[str]) -> list[str]:
   seen: set[str] = set()
   for source in [left, right]:
     for tag in source:
-      safe_tag = _normalize_term(tag)
+      safe_tag = _fast_term(tag)
       if not safe_tag:
         continue
-      safe_tag = _normalize_token(_KEY_ALIAS_MAP.get(safe_tag, safe_tag), max_len=MAX_TAG_LEN)
+      safe_tag = _fast_token(_KEY_ALIAS_MAP.get(safe_tag, safe_tag), max_len=MAX_TAG_LEN)
       if not safe_tag or safe_tag in seen:
         continue
       seen.add(safe_tag)
@@ -406,11 +477,14 @@ def _tokenize_query(value: str) -> list[str]:
   safe = _normalize_text(value, max_len=320).lower()
   if not safe:
     return []
-  tokens = re.findall(r"[^\W_]{2,}", safe, flags=re.UNICODE)
+  if safe.isascii():
+    tokens = [token for token in safe.translate(_ASCII_DELIM).split() if len(token) >= 2]
+  else:
+    tokens = _RE_WORDS.findall(safe)
   deduped: list[str] = []
   seen: set[str] = set()
   for token in tokens:
-    safe_token = _normalize_term(token)
+    safe_token = _fast_term(token)
     if not safe_token or safe_token in seen or safe_token in _QUERY_STOPWORDS:
       continue
     seen.add(safe_token)
@@ -421,39 +495,37 @@ def _tokenize_query(value: str) -> list[str]:
 
 
 def _expand_query_terms(terms: list[str]) -> list[str]:
-  expanded: list[str] = []
-  seen: set[str] = set()
+  return list(_expand_query_terms_cached(tuple(terms)))
+
+
+@lru_cache(maxsize=1024)
+def _expand_query_terms_cached(terms: tuple[str, ...]) -> tuple[str, ...]:
+  # dict keeps first-seen order and dedupes in C; alias tuples are normalized at build time.
+  expanded: dict[str, None] = {}
   for raw in terms:
-    term = _normalize_term(raw)
+    term = _fast_term(raw)
     if not term:
       continue
-    for candidate in [term, *_QUERY_SYNONYM_ALIASES.get(term, set())]:
-      safe_candidate = _normalize_term(candidate)
-      if not safe_candidate or safe_candidate in seen:
-        continue
-      seen.add(safe_candidate)
-      expanded.append(safe_candidate)
-  return expanded
+    expanded[term] = None
+    expanded.update(dict.fromkeys(_QUERY_SYNONYM_ALIASES.get(term, _EMPTY)))
+  return tuple(expanded)
 
 
 def _infer_key_from_terms(terms: list[str]) -> str:
-  for term in terms:
-    token = _normalize_token(term, max_len=MAX_KEY_LEN)
-    if not token:
-      continue
-    mapped = _normalize_term(_KEY_ALIAS_MAP.get(token, token))
-    if mapped in _KNOWN_INFER_KEYS:
-      return mapped
-  return ""
+  return next(
+    (mapped for term in terms if (mapped := _INFER_KEY_MAP.get(_fast_token(term, max_len=MAX_KEY_LEN)))),
+    "",
+  )
 
 
 def _looks_like_generic_recall_query(value: str) -> bool:
   query = _normalize_text(value, max_len=240).lower()
   if not query:
     return False
-  for pattern in _GENERIC_RECALL_PATTERNS:
-    if re.search(pattern, query, flags=re.IGNORECASE):
-      return True
+  if any(anchor in query for anchor in _RECALL_ANCHORS):
+    for pattern in _GENERIC_RECALL_RE:
+      if pattern.search(query):
+        return True
 
   # If only memory-intent verbs remain after stopword filtering, treat it as a generic recall query.
   intent_terms = set(_tokenize_query(query))
@@ -473,8 +545,8 @@ def _looks_like_generic_memory_list_query(value: str) -> bool:
   query = _normalize_text(value, max_len=240).lower()
   if not query:
     return False
-  for pattern in _GENERIC_LIST_PATTERNS:
-    if re.search(pattern, query, flags=re.IGNORECASE):
+  for pattern in _GENERIC_LIST_RE:
+    if pattern.search(query):
       return True
   return False
 
@@ -514,10 +586,9 @@ def _infer_slot_from_text(text: str) -> tuple[str, list[str]]:
   safe = _normalize_text(text, max_len=MAX_FACT_LEN).lower()
   if not safe:
     return "", []
-  for slot_key, pattern_list, tags in _SLOT_HINT_RULES:
-    for pattern in pattern_list:
-      if re.search(pattern, safe, flags=re.IGNORECASE):
-        return slot_key, list(tags)
+  for slot_key, pattern, tags in _SLOT_HINT_RE:
+    if pattern.search(safe):
+      return slot_key, list(tags)
   return "", []
 
 
@@ -542,6 +613,12 @@ def _parse_iso(value: Any) -> dt.datetime:
     return dt.datetime.fromtimestamp(0, tz=dt.timezone.utc)
 
 
+@lru_cache(maxsize=4096)
+def _parse_iso_ts(raw: str) -> float:
+  # Timestamp-only view of _parse_iso; loads reparse the same few thousand strings.
+  return _parse_iso(raw).timestamp()
+
+
 def _new_memory_id() -> str:
   return f"mem-{uuid.uuid4().hex[:12]}"
 
@@ -561,54 +638,134 @@ def _build_lexical_blob(entry: dict[str, Any]) -> str:
   return _normalize_text(" ".join(part for part in pieces if part), max_len=4000)
 
 
-def _build_sparse_vector(text: str) -> dict[str, float]:
+def _sparse_key(value: str, *, gram: bool) -> int:
+  # crc32 is stable across processes (unlike hash()), so keys can be persisted.
+  key = zlib.crc32(value.encode("utf-8"))
+  return key | _SPARSE_GRAM_BIT if gram else key
+
+
+def _encode_sparse_vector(vector: dict[int, float]) -> str:
+  # Parallel [keys, weights] arrays: decoding is json.loads plus one dict(zip()).
+  return json.dumps([list(vector), list(vector.values())], separators=(",", ":"))
+
+
+def _decode_sparse_vector(raw: Any) -> dict[int, float]:
+  if isinstance(raw, list):
+    if len(raw) != 2 or not isinstance(raw[0], list) or not isinstance(raw[1], list) or len(raw[0]) != len(raw[1]):
+      return {}
+    keys, weights = raw
+    if not all(type(key) is int for key in keys):
+      return {}
+    try:
+      return dict(zip(keys, map(float, weights)))
+    except (TypeError, ValueError):
+      return {}
+  # Object form written by earlier versions; legacy "t:"/"g:" string keys yield {} so callers rebuild.
+  if not isinstance(raw, dict):
+    return {}
+  vector: dict[int, float] = {}
+  for key, value in raw.items():
+    if isinstance(key, str) and key.isdigit():
+      key = int(key)
+    if not isinstance(key, int) or not isinstance(value, (int, float)):
+      return {}
+    vector[key] = float(value)
+  return vector
+
+
+# Shared across callers: the returned vector is treated as read-only everywhere.
+@lru_cache(maxsize=1024)
+def _build_sparse_vector(text: str) -> dict[int, float]:
   terms = _expand_query_terms(_tokenize_query(text))
   if not terms:
     return {}
-  weights: dict[str, float] = {}
-  for term in terms:
-    key = f"t:{term}"
-    weights[key] = float(weights.get(key, 0.0) + 1.0)
-    if len(term) >= 4:
-      for idx in range(len(term) - 2):
-        gram = term[idx: idx + 3]
-        g_key = f"g:{gram}"
-        weights[g_key] = float(weights.get(g_key, 0.0) + 0.2)
+  # Count strings first so each distinct term/gram is hashed once.
+  term_counts = Counter(terms)
+  gram_counts = Counter(
+    term[idx: idx + 3]
+    for term in terms
+    if len(term) >= 4
+    for idx in range(len(term) - 2)
+  )
+  weights: dict[int, float] = {}
+  for term, count in term_counts.items():
+    key = _sparse_key(term, gram=False)
+    weights[key] = weights.get(key, 0.0) + float(count)
+  for gram, count in gram_counts.items():
+    key = _sparse_key(gram, gram=True)
+    weights[key] = weights.get(key, 0.0) + count * 0.2
   if len(weights) > MAX_VECTOR_TERMS:
-    top_items = sorted(weights.items(), key=lambda item: item[1], reverse=True)[:MAX_VECTOR_TERMS]
-    return {key: value for key, value in top_items}
+    return dict(heapq.nlargest(MAX_VECTOR_TERMS, weights.items(), key=lambda item: item[1]))
   return weights
 
 
-def _cosine_similarity(left: dict[str, float], right: dict[str, float]) -> float:
-  if not left or not right:
-    return 0.0
-  dot = 0.0
-  left_norm = 0.0
-  right_norm = 0.0
-  for key, value in left.items():
-    left_norm += value * value
-    dot += value * float(right.get(key, 0.0))
-  for value in right.values():
-    right_norm += value * value
-  if left_norm <= 0.0 or right_norm <= 0.0:
-    return 0.0
-  return dot / (math.sqrt(left_norm) * math.sqrt(right_norm))
+def _vector_norm(vector: dict[int, float]) -> float:
+  return math.sqrt(sum(value * value for value in vector.values()))
+
 
+def _similarity_ratio(left: str, right: str) -> float:
+  # Thresholds below are tuned for difflib, so the score itself always comes from SequenceMatcher.
+  return SequenceMatcher(a=left, b=right).ratio()
+
+
+def _similarity_upper_bound(left: str, right: str) -> float:
+  # rapidfuzz's ratio is 2*LCS/(len sum); SequenceMatcher's matching blocks are a common
+  # subsequence, so this never falls below _similarity_ratio (up to float rounding).
+  if _rf_fuzz is None:
+    return 1.0
+  return _rf_fuzz.ratio(left, right, processor=None) / 100.0 + _RATIO_BOUND_SLACK
+
+
+def _ratio_at_least(left: str, right: str, threshold: float) -> bool:
+  if _similarity_upper_bound(left, right) < threshold:
+    return False
+  return _similarity_ratio(left, right) >= threshold
 
-def _fuzzy_similarity(query: str, target: str) -> float:
+
+def _trim_fifo_cache(cache: dict[Any, Any], max_size: int) -> None:
+  # Another thread may evict the same oldest key first, so tolerate it being gone.
+  while len(cache) > max_size:
+    cache.pop(next(iter(cache), None), None)
+
+
+def _fuzzy_operands(query: str, targets: list[str]) -> tuple[str, list[str]]:
   q = _normalize_text(query, max_len=220).lower()
-  t = _normalize_text(target, max_len=420).lower()
-  if not q or not t:
-    return 0.0
-  return SequenceMatcher(a=q, b=t).ratio()
+  return q, [_normalize_text(target, max_len=420).lower() for target in targets]
+
+
+def _fuzzy_upper_bounds(q: str, targets: list[str]) -> list[float]:
+  if not q:
+    return [0.0] * len(targets)
+  if _rf_process is None:
+    return [1.0] * len(targets)
+  if _np is not None and len(targets) >= FUZZY_BATCH_MIN:
+    # One native call for the batch; single worker, since the strings are short.
+    matrix = _rf_process.cdist([q], targets, scorer=_rf_fuzz.ratio, processor=None, dtype=_np.float64, workers=1)
+    return [score / 100.0 + _RATIO_BOUND_SLACK for score in matrix[0].tolist()]
+  return [_similarity_upper_bound(q, target) for target in targets]
+
+
+def _fuzzy_similarities(q: str, targets: list[str]) -> list[float]:
+  if not q:
+    return [0.0] * len(targets)
+  # Keyed on the compared strings themselves, so edited entries miss without any flush.
+  # Scores are collected locally first: the trim below may evict pairs this call just hit.
+  scores: dict[str, float] = {}
+  missing = False
+  for target in dict.fromkeys(targets):
+    score = _FUZZY_CACHE.get((q, target))
+    if score is None:
+      score = _similarity_ratio(q, target) if target else 0.0
+      _FUZZY_CACHE[(q, target)] = score
+      missing = True
+    scores[target] = score
+  if missing:
+    _trim_fifo_cache(_FUZZY_CACHE, FUZZY_CACHE_MAX)
+  return [scores[target] for target in targets]
 
 
 def _latinize_cyrillic(value: str) -> str:
-  chars: list[str] = []
-  for ch in value:
-    chars.append(_CYRILLIC_TO_LATIN.get(ch, ch))
-  return "".join(chars)
+  return value.translate(_CYRILLIC_TRANS)
 
 
 def _normalize_user_identity(value: Any) -> str:
@@ -616,8 +773,8 @@ def _normalize_user_identity(value: Any) -> str:
   if not raw:
     return ""
   latin = _latinize_cyrillic(raw)
-  latin = re.sub(r"[^a-z0-9]+", " ", latin, flags=re.IGNORECASE)
-  return re.sub(r"\s+", " ", latin).strip()
+  latin = _RE_NON_ALNUM.sub(" ", latin)
+  return _RE_WS.sub(" ", latin).strip()
 
 
 def _split_user_identity(value: Any) -> list[str]:
@@ -637,14 +794,28 @@ def _split_user_identity(value: Any) -> list[str]:
   return deduped
 
 
-def _user_identities_match(runtime_user_name: str, entry_user_name: str) -> bool:
-  if not runtime_user_name or not entry_user_name:
+class _UserKey(NamedTuple):
+  lower: str
+  latin: str
+  tokens: tuple[str, ...]
+
+
+@lru_cache(maxsize=512)
+def _make_user_key(value: str) -> _UserKey:
+  lower = _normalize_text(value, max_len=96).lower()
+  return _UserKey(lower=lower, latin=_normalize_user_identity(lower), tokens=tuple(_split_user_identity(lower)))
+
+
+# Entries share a handful of user names, so each (runtime, entry) pair is matched once.
+@lru_cache(maxsize=1024)
+def _user_identities_match(runtime_key: _UserKey, entry_key: _UserKey) -> bool:
+  if not runtime_key.lower or not entry_key.lower:
     return False
-  if runtime_user_name == entry_user_name:
+  if runtime_key.lower == entry_key.lower:
     return True
 
-  runtime_norm = _normalize_user_identity(runtime_user_name)
-  entry_norm = _normalize_user_identity(entry_user_name)
+  runtime_norm = runtime_key.latin
+  entry_norm = entry_key.latin
   if not runtime_norm or not entry_norm:
     return False
   if runtime_norm == entry_norm:
@@ -655,8 +826,8 @@ def _user_identities_match(runtime_user_name: str, entry_user_name: str) -> bool
   if len(entry_norm) >= 4 and entry_norm in runtime_norm:
     return True
 
-  runtime_tokens = _split_user_identity(runtime_user_name)
-  entry_tokens = _split_user_identity(entry_user_name)
+  runtime_tokens = runtime_key.tokens
+  entry_tokens = entry_key.tokens
   if runtime_tokens and entry_tokens:
     runtime_set = set(runtime_tokens)
     entry_set = set(entry_tokens)
@@ -666,10 +837,10 @@ def _user_identities_match(runtime_user_name: str, entry_user_name: str) -> bool
     # Handle transliteration variants like "andrey" vs "andrei".
     for left in runtime_tokens:
       for right in entry_tokens:
-        if SequenceMatcher(a=left, b=right).ratio() >= 0.78:
+        if _ratio_at_least(left, right, 0.78):
           return True
 
-  return SequenceMatcher(a=runtime_norm, b=entry_norm).ratio() >= 0.72
+  return _ratio_at_least(runtime_norm, entry_norm, 0.72)
 
 
 def _normalize_memory_entry(raw: Any) -> dict[str, Any] | None:
@@ -686,7 +857,7 @@ def _normalize_memory_entry(raw: Any) -> dict[str, Any] | None:
   updated_at = _normalize_text(raw.get("updated_at"), max_len=64) or created_at
   user_name = _normalize_text(raw.get("user_name"), max_len=96)
   chat_id = _normalize_text(raw.get("chat_id"), max_len=96)
-  return {
+  entry: dict[str, Any] = {
     "id": entry_id,
     "key": key,
     "fact": fact,
@@ -697,16 +868,66 @@ def _normalize_memory_entry(raw: Any) -> dict[str, Any] | None:
     "user_name": user_name,
     "chat_id": chat_id,
   }
+  # Keep derived search fields so rewrites do not rebuild them for unchanged rows.
+  lexical_blob = raw.get("_lexical_blob")
+  if isinstance(lexical_blob, str) and lexical_blob:
+    entry["_lexical_blob"] = lexical_blob
+  semantic_vector = raw.get("_semantic_vector")
+  if isinstance(semantic_vector, dict) and semantic_vector:
+    entry["_semantic_vector"] = semantic_vector
+    semantic_norm = raw.get("_semantic_norm")
+    if isinstance(semantic_norm, float):
+      entry["_semantic_norm"] = semantic_norm
+  _refresh_search_fields(entry)
+  return entry
+
+
+def _persisted_entry(entry: dict[str, Any]) -> dict[str, Any]:
+  return {key: value for key, value in entry.items() if not key.startswith("_")}
+
+
+def _refresh_search_fields(entry: dict[str, Any]) -> None:
+  # Lowercased match fields and the parsed timestamp, so hot loops skip re-normalizing per call.
+  entry["_fact_lc"] = _normalize_text(entry.get("fact"), max_len=MAX_FACT_LEN).lower()
+  entry["_key_lc"] = _canonicalize_key(entry.get("key"))
+  entry["_tags_lc"] = tuple(tag.lower() for tag in _normalize_tags(entry.get("tags")))
+  # Terms never contain the unit separator, so one substring test covers every tag.
+  entry["_tags_blob"] = "\x1f".join(entry["_tags_lc"])
+  entry["_tag_set"] = frozenset(entry["_tags_lc"])
+  entry["_updated_ts"] = _parse_iso_ts(str(entry.get("updated_at") or ""))
+  entry["_user_key"] = _make_user_key(str(entry.get("user_name") or ""))
+  entry.pop("_blob", None)
+
+
+def _refresh_lexical_fields(entry: dict[str, Any]) -> None:
+  lexical_blob = _build_lexical_blob(entry)
+  entry["_lexical_blob"] = lexical_blob
+  semantic_vector = _build_sparse_vector(lexical_blob)
+  entry["_semantic_vector"] = semantic_vector
+  entry["_semantic_norm"] = _vector_norm(semantic_vector)
+  _refresh_search_fields(entry)
 
 
 def _entry_sort_key(entry: dict[str, Any]) -> tuple[float, int]:
-  return (_parse_iso(entry.get("updated_at")).timestamp(), int(entry.get("importance") or 3))
+  updated_ts = entry.get("_updated_ts")
+  if not isinstance(updated_ts, float):
+    updated_ts = _parse_iso_ts(str(entry.get("updated_at") or ""))
+  return (updated_ts, int(entry.get("importance") or 3))
 
 
 def _prepare_entries(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+  if len(entries) > MAX_ENTRIES:
+    # Only the newest MAX_ENTRIES survive, so a bounded heap replaces the full sort.
+    cleaned = _clean_sorted_entries(heapq.nlargest(MAX_ENTRIES, entries, key=_entry_sort_key))
+    if len(cleaned) >= MAX_ENTRIES:
+      return cleaned
+  return _clean_sorted_entries(sorted(entries, key=_entry_sort_key, reverse=True))
+
+
+def _clean_sorted_entries(entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
   cleaned: list[dict[str, Any]] = []
   seen_ids: set[str] = set()
-  for item in sorted(entries, key=_entry_sort_key, reverse=True):
+  for item in entries:
     normalized = _normalize_memory_entry(item)
     if not normalized:
       continue
@@ -730,58 +951,129 @@ def _get_sqlite_handles(host: Any) -> tuple[Any, sqlite3.Connection, Any] | None
   return storage, conn, lock
 
 
+def _entry_content_key(entry: dict[str, Any]) -> tuple[Any, ...]:
+  # updated_at has one-second resolution, so everything the blob and vector derive from is included.
+  return (
+    str(entry.get("id") or ""),
+    str(entry.get("updated_at") or ""),
+    str(entry.get("key") or ""),
+    str(entry.get("fact") or ""),
+    tuple(entry.get("tags") or ()),
+  )
+
+
+def _cached_lexical_payload(entry: dict[str, Any]) -> tuple[str, str]:
+  cache_key = _entry_content_key(entry)
+  cached = _BLOB_CACHE.get(cache_key)
+  if cached is not None:
+    return cached
+  lexical_blob = entry.get("_lexical_blob")
+  semantic_vector = entry.get("_semantic_vector")
+  if not lexical_blob or not isinstance(semantic_vector, dict):
+    lexical_blob = _build_lexical_blob(entry)
+    semantic_vector = _build_sparse_vector(lexical_blob)
+  semantic_json = _encode_sparse_vector(semantic_vector)
+  payload = (lexical_blob, semantic_json)
+  _BLOB_CACHE[cache_key] = payload
+  _trim_fifo_cache(_BLOB_CACHE, MAX_ENTRIES * 2)
+  return payload
+
+
+def _sqlite_entry_payload(entry: dict[str, Any]) -> tuple[Any, ...]:
+  lexical_blob, semantic_json = _cached_lexical_payload(entry)
+  return (
+    str(entry.get("id") or ""),
+    _canonicalize_key(entry.get("key")),
+    _normalize_text(entry.get("fact"), max_len=MAX_FACT_LEN),
+    json.dumps(_normalize_tags(entry.get("tags")), ensure_ascii=False),
+    _safe_int(entry.get("importance"), fallback=3, min_value=1, max_value=5),
+    _normalize_text(entry.get("created_at"), max_len=64) or _now_utc_iso(),
+    _normalize_text(entry.get("updated_at"), max_len=64) or _now_utc_iso(),
+    _normalize_text(entry.get("user_name"), max_len=96),
+    _normalize_text(entry.get("chat_id"), max_len=96),
+    lexical_blob,
+    semantic_json,
+  )
+
+
+_SQL_INSERT_ENTRY = f"""
+  INSERT INTO {SQL_TABLE}(
+    id, key, fact, tags_json, importance, created_at, updated_at, user_name, chat_id, lexical_blob, semantic_json
+  ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def _replace_sqlite_entries_locked(conn: sqlite3.Connection, entries: list[dict[str, Any]], *, fts_enabled: bool) -> None:
+  # With FTS enabled the table triggers keep {SQL_FTS_TABLE} in sync; clearing it first keeps
+  # the per-row delete trigger from scanning stale rows.
+  if fts_enabled:
+    conn.execute(f"DELETE FROM {SQL_FTS_TABLE}")
   conn.execute(f"DELETE FROM {SQL_TABLE}")
   if entries:
-    payloads: list[tuple[Any, ...]] = []
-    for entry in entries:
-      lexical_blob = _build_lexical_blob(entry)
-      semantic_json = json.dumps(_build_sparse_vector(lexical_blob), ensure_ascii=False, separators=(",", ":"))
-      payloads.append(
-        (
-          str(entry.get("id") or ""),
-          _canonicalize_key(entry.get("key")),
-          _normalize_text(entry.get("fact"), max_len=MAX_FACT_LEN),
-          json.dumps(_normalize_tags(entry.get("tags")), ensure_ascii=False),
-          _safe_int(entry.get("importance"), fallback=3, min_value=1, max_value=5),
-          _normalize_text(entry.get("created_at"), max_len=64) or _now_utc_iso(),
-          _normalize_text(entry.get("updated_at"), max_len=64) or _now_utc_iso(),
-          _normalize_text(entry.get("user_name"), max_len=96),
-          _normalize_text(entry.get("chat_id"), max_len=96),
-          lexical_blob,
-          semantic_json,
-        )
-      )
-    conn.executemany(
+    conn.executemany(_SQL_INSERT_ENTRY, [_sqlite_entry_payload(entry) for entry in entries])
+
+
+def _upsert_sqlite_entry_locked(conn: sqlite3.Connection, entry: dict[str, Any]) -> None:
+  conn.execute(
+    _SQL_INSERT_ENTRY
+    + """
+    ON CONFLICT(id) DO UPDATE SET
+      key = excluded.key,
+      fact = excluded.fact,
+      tags_json = excluded.tags_json,
+      importance = excluded.importance,
+      created_at = excluded.created_at,
+      updated_at = excluded.updated_at,
+      user_name = excluded.user_name,
+      chat_id = excluded.chat_id,
+      lexical_blob = excluded.lexical_blob,
+      semantic_json = excluded.semantic_json
+    """,
+    _sqlite_entry_payload(entry),
+  )
+
+
+def _ensure_sqlite_fts_triggers_locked(conn: sqlite3.Connection) -> None:
+  # FTS rows share the main table rowid, so trigger deletes are index lookups.
+  existing = conn.execute(
+    "SELECT COUNT(1) AS c FROM sqlite_master WHERE type = 'trigger' AND name = ?",
+    (f"trg_{SQL_TABLE}_ai",),
+  ).fetchone()
+  has_triggers = bool(existing and int(existing["c"]) > 0)
+  fts_columns = "rowid, id, fact, key, tags, lexical_blob"
+  fts_values = "new.rowid, new.id, new.fact, new.key, new.tags_json, new.lexical_blob"
+  conn.execute(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{SQL_TABLE}_ai AFTER INSERT ON {SQL_TABLE} BEGIN
+      INSERT INTO {SQL_FTS_TABLE}({fts_columns}) VALUES({fts_values});
+    END
+    """
+  )
+  conn.execute(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{SQL_TABLE}_ad AFTER DELETE ON {SQL_TABLE} BEGIN
+      DELETE FROM {SQL_FTS_TABLE} WHERE rowid = old.rowid;
+    END
+    """
+  )
+  conn.execute(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_{SQL_TABLE}_au AFTER UPDATE ON {SQL_TABLE} BEGIN
+      DELETE FROM {SQL_FTS_TABLE} WHERE rowid = old.rowid;
+      INSERT INTO {SQL_FTS_TABLE}({fts_columns}) VALUES({fts_values});
+    END
+    """
+  )
+  if not has_triggers:
+    # Rows written before the triggers existed used independent FTS rowids.
+    conn.execute(f"DELETE FROM {SQL_FTS_TABLE}")
+    conn.execute(
       f"""
-      INSERT INTO {SQL_TABLE}(
-        id, key, fact, tags_json, importance, created_at, updated_at, user_name, chat_id, lexical_blob, semantic_json
-      ) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-      """,
-      payloads,
+      INSERT INTO {SQL_FTS_TABLE}({fts_columns})
+      SELECT rowid, id, fact, key, tags_json, lexical_blob FROM {SQL_TABLE}
+      """
     )
 
-  if fts_enabled:
-    conn.execute(f"DELETE FROM {SQL_FTS_TABLE}")
-    if entries:
-      fts_payloads = [
-        (
-          str(entry.get("id") or ""),
-          _normalize_text(entry.get("fact"), max_len=MAX_FACT_LEN),
-          _canonicalize_key(entry.get("key")),
-          " ".join(_normalize_tags(entry.get("tags"))),
-          _build_lexical_blob(entry),
-        )
-        for entry in entries
-      ]
-      conn.executemany(
-        f"""
-        INSERT INTO {SQL_FTS_TABLE}(id, fact, key, tags, lexical_blob)
-        VALUES(?, ?, ?, ?, ?)
-        """,
-        fts_payloads,
-      )
-
 
 def _ensure_sqlite_schema(host: Any) -> bool:
   global _SQLITE_SCHEMA_READY
@@ -833,6 +1125,7 @@ def _ensure_sqlite_schema(host: Any) -> bool:
           USING fts5(id UNINDEXED, fact, key, tags, lexical_blob)
           """
         )
+        _ensure_sqlite_fts_triggers_locked(conn)
         fts_enabled = True
       except sqlite3.Error:
         fts_enabled = False
@@ -883,69 +1176,77 @@ def _load_entries_from_settings(host: Any) -> list[dict[str, Any]]:
 
 def _save_entries_to_settings(host: Any, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
   cleaned = _prepare_entries(entries)
-  host.storage.set_setting_json(STORAGE_KEY, cleaned[:JSON_MIRROR_MAX])
+  host.storage.set_setting_json(STORAGE_KEY, [_persisted_entry(entry) for entry in cleaned[:JSON_MIRROR_MAX]])
   return cleaned
 
 
-def _load_entries_from_sqlite(host: Any) -> list[dict[str, Any]] | None:
+def _entry_from_sqlite_row(row: sqlite3.Row) -> dict[str, Any] | None:
+  try:
+    tags = json.loads(str(row["tags_json"] or "[]"))
+  except (TypeError, ValueError, json.JSONDecodeError):
+    tags = []
+  try:
+    semantic_vector = json.loads(str(row["semantic_json"] or "{}"))
+  except (TypeError, ValueError, json.JSONDecodeError):
+    semantic_vector = {}
+
+  entry = _normalize_memory_entry(
+    {
+      "id": row["id"],
+      "key": row["key"],
+      "fact": row["fact"],
+      "tags": tags,
+      "importance": row["importance"],
+      "created_at": row["created_at"],
+      "updated_at": row["updated_at"],
+      "user_name": row["user_name"],
+      "chat_id": row["chat_id"],
+    }
+  )
+  if not entry:
+    return None
+  lexical_blob = _normalize_text(row["lexical_blob"], max_len=4000)
+  if lexical_blob:
+    entry["_lexical_blob"] = lexical_blob
+  semantic_vector = _decode_sparse_vector(semantic_vector)
+  if semantic_vector:
+    entry["_semantic_vector"] = semantic_vector
+  return entry
+
+
+def _load_entries_from_sqlite(host: Any, *, user_names: list[str] | None = None) -> list[dict[str, Any]] | None:
   if not _ensure_sqlite_schema(host):
     return None
   handles = _get_sqlite_handles(host)
   if handles is None:
     return None
   _storage, conn, lock = handles
+  where = ""
+  params: tuple[Any, ...] = (MAX_ENTRIES,)
+  if user_names is not None:
+    where = f"WHERE user_name IN ({', '.join('?' for _ in user_names)})"
+    params = (*user_names, MAX_ENTRIES)
+
   try:
     with lock:
       rows = conn.execute(
         f"""
         SELECT id, key, fact, tags_json, importance, created_at, updated_at, user_name, chat_id, lexical_blob, semantic_json
         FROM {SQL_TABLE}
-        ORDER BY updated_at DESC
+        {where}
+        ORDER BY updated_at DESC, rowid ASC
         LIMIT ?
         """,
-        (MAX_ENTRIES,),
+        params,
       ).fetchall()
   except sqlite3.Error:
     return None
-
+  # Normalize after releasing the shared lock; rows are capped at MAX_ENTRIES anyway.
   entries: list[dict[str, Any]] = []
   for row in rows:
-    try:
-      tags = json.loads(str(row["tags_json"] or "[]"))
-    except (TypeError, ValueError, json.JSONDecodeError):
-      tags = []
-    try:
-      semantic_vector = json.loads(str(row["semantic_json"] or "{}"))
-    except (TypeError, ValueError, json.JSONDecodeError):
-      semantic_vector = {}
-    if not isinstance(semantic_vector, dict):
-      semantic_vector = {}
-
-    entry = _normalize_memory_entry(
-      {
-        "id": row["id"],
-        "key": row["key"],
-        "fact": row["fact"],
-        "tags": tags,
-        "importance": row["importance"],
-        "created_at": row["created_at"],
-        "updated_at": row["updated_at"],
-        "user_name": row["user_name"],
-        "chat_id": row["chat_id"],
-      }
-    )
-    if not entry:
-      continue
-    lexical_blob = _normalize_text(row["lexical_blob"], max_len=4000)
-    if lexical_blob:
-      entry["_lexical_blob"] = lexical_blob
-    if semantic_vector:
-      entry["_semantic_vector"] = {
-        str(key): float(value)
-        for key, value in semantic_vector.items()
-        if isinstance(key, str) and isinstance(value, (int, float))
-      }
-    entries.append(entry)
+    entry = _entry_from_sqlite_row(row)
+    if entry:
+      entries.append(entry)
   return entries
 
 
@@ -963,11 +1264,46 @@ def _save_entries_to_sqlite(host: Any, entries: list[dict[str, Any]]) -> list[di
   except sqlite3.Error:
     return None
 
-  storage.set_setting_json(STORAGE_KEY, cleaned[:JSON_MIRROR_MAX])
+  storage.set_setting_json(STORAGE_KEY, [_persisted_entry(entry) for entry in cleaned[:JSON_MIRROR_MAX]])
   return cleaned
 
 
+def _entries_version(host: Any) -> int:
+  return _safe_int(host.storage.get_setting_json(ENTRIES_VERSION_KEY, 0), fallback=0, min_value=0, max_value=2**62)
+
+
+def _bump_entries_version(host: Any, saved: list[dict[str, Any]]) -> None:
+  # The just-written set is what the next load would read back, so it seeds the cache.
+  version = (_entries_version(host) + 1) % 2**62
+  host.storage.set_setting_json(ENTRIES_VERSION_KEY, version)
+  try:
+    setattr(host, HOST_CACHE_ATTR, (version, saved))
+  except (AttributeError, TypeError):
+    pass
+
+
+def _cached_entries(host: Any, version: int) -> list[dict[str, Any]] | None:
+  cached = getattr(host, HOST_CACHE_ATTR, None)
+  if isinstance(cached, tuple) and len(cached) == 2 and cached[0] == version:
+    # Callers append to / reassign items in the list they get, never the shared entry dicts.
+    return list(cached[1])
+  return None
+
+
 def _load_entries(host: Any) -> list[dict[str, Any]]:
+  version = _entries_version(host)
+  cached = _cached_entries(host, version)
+  if cached is not None:
+    return cached
+  entries = _load_entries_uncached(host)
+  try:
+    setattr(host, HOST_CACHE_ATTR, (version, entries))
+  except (AttributeError, TypeError):
+    return entries
+  return list(entries)
+
+
+def _load_entries_uncached(host: Any) -> list[dict[str, Any]]:
   sqlite_entries = _load_entries_from_sqlite(host)
   if sqlite_entries is not None:
     if sqlite_entries:
@@ -983,11 +1319,94 @@ def _load_entries(host: Any) -> list[dict[str, Any]]:
   return _load_entries_from_settings(host)
 
 
+def _matching_sqlite_user_names(host: Any, runtime_user_name: str) -> list[str] | None:
+  if not _ensure_sqlite_schema(host):
+    return None
+  handles = _get_sqlite_handles(host)
+  if handles is None:
+    return None
+  _storage, conn, lock = handles
+  try:
+    with lock:
+      rows = conn.execute(f"SELECT DISTINCT user_name FROM {SQL_TABLE}").fetchall()
+  except sqlite3.Error:
+    return None
+  if not rows:
+    return None
+  # Identity matching is fuzzy (transliteration, token overlap), so it runs per distinct name in Python.
+  runtime_key = _make_user_key(runtime_user_name)
+  return [
+    str(row["user_name"] or "")
+    for row in rows
+    if _matches_scope({"user_name": row["user_name"]}, scope="current_user", runtime_key=runtime_key)
+  ]
+
+
+def _load_entries_for_scope(host: Any, *, scope: str, runtime_user_name: str) -> list[dict[str, Any]]:
+  # Read-only paths only: remember/forget rewrite the full set and need every entry.
+  # A warm full cache beats a scoped query; callers filter by scope anyway.
+  cached = _cached_entries(host, _entries_version(host))
+  if cached is not None:
+    return cached
+  if scope != "all" and runtime_user_name:
+    user_names = _matching_sqlite_user_names(host, runtime_user_name)
+    if user_names is not None:
+      if not user_names:
+        return []
+      entries = _load_entries_from_sqlite(host, user_names=user_names)
+      if entries is not None:
+        return entries
+  return _load_entries(host)
+
+
 def _save_entries(host: Any, entries: list[dict[str, Any]]) -> list[dict[str, Any]]:
+  global _SPARSE_INDEX_CACHE
+  _SPARSE_INDEX_CACHE = None
   saved = _save_entries_to_sqlite(host, entries)
-  if saved is not None:
-    return saved
-  return _save_entries_to_settings(host, entries)
+  if saved is None:
+    saved = _save_entries_to_settings(host, entries)
+    # Without SQLite only the JSON mirror persists.
+    _bump_entries_version(host, saved[:JSON_MIRROR_MAX])
+  else:
+    _bump_entries_version(host, saved)
+  return list(saved)
+
+
+def _save_changed_entry(host: Any, entries: list[dict[str, Any]], changed: dict[str, Any]) -> list[dict[str, Any]]:
+  # The other entries come from a load and are already normalized and newest-first, so only
+  # the changed one is normalized and upserted; it must sort first or a full rewrite runs.
+  global _SPARSE_INDEX_CACHE
+  _SPARSE_INDEX_CACHE = None
+  changed_id = str(changed.get("id") or "")
+  target = _normalize_memory_entry(changed)
+  others = [entry for entry in entries if entry is not changed]
+  if (
+    target is None
+    or target.get("id") != changed_id
+    or len(others) != len(entries) - 1
+    or (others and _entry_sort_key(others[0]) >= _entry_sort_key(target))
+    or any(entry.get("id") == changed_id for entry in others)
+    or not _ensure_sqlite_schema(host)
+  ):
+    return _save_entries(host, entries)
+  handles = _get_sqlite_handles(host)
+  if handles is None:
+    return _save_entries(host, entries)
+  storage, conn, lock = handles
+  cleaned = [target, *others[: MAX_ENTRIES - 1]]
+  pruned = others[MAX_ENTRIES - 1 :]
+  try:
+    with lock, conn:
+      _upsert_sqlite_entry_locked(conn, target)
+      if pruned:
+        conn.executemany(f"DELETE FROM {SQL_TABLE} WHERE id = ?", [(str(entry.get("id") or ""),) for entry in pruned])
+  except sqlite3.Error:
+    return _save_entries(host, entries)
+
+  # The mirror is rewritten on every save; it is capped at JSON_MIRROR_MAX entries, not N.
+  storage.set_setting_json(STORAGE_KEY, [_persisted_entry(entry) for entry in cleaned[:JSON_MIRROR_MAX]])
+  _bump_entries_version(host, cleaned)
+  return list(cleaned)
 
 
 def _resolve_scope(value: Any) -> str:
@@ -995,17 +1414,18 @@ def _resolve_scope(value: Any) -> str:
   return scope if scope in {"current_user", "all"} else "current_user"
 
 
-def _matches_scope(entry: dict[str, Any], *, scope: str, runtime_user_name: str) -> bool:
+def _matches_scope(entry: dict[str, Any], *, scope: str, runtime_key: _UserKey) -> bool:
   if scope == "all":
     return True
-  safe_runtime_user = _normalize_text(runtime_user_name, max_len=96).lower()
-  if not safe_runtime_user:
+  if not runtime_key.lower:
     return True
-  entry_user = _normalize_text(entry.get("user_name"), max_len=96).lower()
+  entry_key = entry.get("_user_key")
+  if not isinstance(entry_key, _UserKey):
+    entry_key = _make_user_key(str(entry.get("user_name") or ""))
   # Include user-specific entries and global entries (empty user_name).
-  if not entry_user:
+  if not entry_key.lower:
     return True
-  return _user_identities_match(safe_runtime_user, entry_user)
+  return _user_identities_match(runtime_key, entry_key)
 
 
 def _public_memory(entry: dict[str, Any], *, include_user: bool) -> dict[str, Any]:
@@ -1022,27 +1442,124 @@ def _public_memory(entry: dict[str, Any], *, include_user: bool) -> dict[str, An
   return payload
 
 
-def _entry_vector(entry: dict[str, Any]) -> dict[str, float]:
+def _entry_vector(entry: dict[str, Any]) -> tuple[dict[int, float], float]:
   raw = entry.get("_semantic_vector")
-  if isinstance(raw, dict):
-    vector = {
-      str(key): float(value)
-      for key, value in raw.items()
-      if isinstance(key, str) and isinstance(value, (int, float))
+  norm = entry.get("_semantic_norm")
+  if isinstance(raw, dict) and raw and isinstance(norm, float):
+    return raw, norm
+  vector = _decode_sparse_vector(raw)
+  if not vector:
+    blob = _normalize_text(entry.get("_lexical_blob"), max_len=4000)
+    if not blob:
+      blob = _build_lexical_blob(entry)
+    vector = _build_sparse_vector(blob)
+  norm = _vector_norm(vector)
+  if vector:
+    entry["_semantic_vector"] = vector
+    entry["_semantic_norm"] = norm
+  return vector, norm
+
+
+def _sparse_index(entries: list[dict[str, Any]]) -> tuple[dict[int, tuple[Any, Any]], list[str], Any]:
+  # Sparse key -> (entry positions, weights), plus ids and norms by position.
+  # Rebuilt only when the loaded set changes; NumPy arrays when available.
+  global _SPARSE_INDEX_CACHE
+  signature = tuple(_entry_content_key(entry) for entry in entries)
+  cached = _SPARSE_INDEX_CACHE
+  if cached is not None and cached[0] == signature:
+    return cached[1], cached[2], cached[3]
+  postings: dict[int, tuple[list[int], list[float]]] = {}
+  ids: list[str] = []
+  norms: list[float] = []
+  for position, entry in enumerate(entries):
+    vector, norm = _entry_vector(entry)
+    ids.append(str(entry.get("id") or ""))
+    norms.append(norm)
+    for sparse_key, weight in vector.items():
+      positions, weights = postings.setdefault(sparse_key, ([], []))
+      positions.append(position)
+      weights.append(weight)
+  if _np is not None:
+    postings = {
+      sparse_key: (_np.array(positions, dtype=_np.intp), _np.array(weights, dtype=_np.float64))
+      for sparse_key, (positions, weights) in postings.items()
     }
-    if vector:
-      return vector
-  blob = _normalize_text(entry.get("_lexical_blob"), max_len=4000)
-  if not blob:
-    blob = _build_lexical_blob(entry)
-  return _build_sparse_vector(blob)
+    norms = _np.array(norms, dtype=_np.float64)
+  _SPARSE_INDEX_CACHE = (signature, postings, ids, norms)
+  return postings, ids, norms
+
+
+def _semantic_scores(entries: list[dict[str, Any]], query_vector: dict[int, float], query_norm: float) -> dict[str, float]:
+  # Cosine for every entry sharing a key with the query; absent ids score 0.0.
+  if not query_vector or query_norm <= 0.0:
+    return {}
+  postings, ids, norms = _sparse_index(entries)
+  hits = [(postings[sparse_key], query_weight) for sparse_key, query_weight in query_vector.items() if sparse_key in postings]
+  if not hits:
+    return {}
+  if _np is not None:
+    # bincount adds in input order, so sums match the pure-Python loop exactly.
+    positions = _np.concatenate([entry_positions for (entry_positions, _weights), _query_weight in hits])
+    contributions = _np.concatenate([weights * query_weight for (_positions, weights), query_weight in hits])
+    dots = _np.bincount(positions, weights=contributions, minlength=len(ids))
+    touched = _np.flatnonzero((dots > 0.0) & (norms > 0.0))
+    scores = dots[touched] / (query_norm * norms[touched])
+    return {ids[position]: score for position, score in zip(touched.tolist(), scores.tolist())}
+  dots: dict[int, float] = {}
+  for (entry_positions, weights), query_weight in hits:
+    for position, weight in zip(entry_positions, weights):
+      dots[position] = dots.get(position, 0.0) + query_weight * weight
+  return {
+    ids[position]: dot / (query_norm * norms[position])
+    for position, dot in dots.items()
+    if norms[position] > 0.0
+  }
+
+
+# Per-term score for a hit in the key, fact, tags and search blob fields, in that order.
+_LEXICAL_FIELD_WEIGHTS = (18.0, 12.0, 10.0, 6.0)
+
+
+def _build_term_automaton(terms: list[str]) -> Any:
+  if _ahocorasick is None or not terms:
+    return None
+  automaton = _ahocorasick.Automaton()
+  for index, term in enumerate(terms):
+    automaton.add_word(term, (index, len(term)))
+  automaton.make_automaton()
+  return automaton
+
+
+def _lexical_hit_weights(terms: list[str], automaton: Any, fields: tuple[str, ...]) -> list[float]:
+  # Weights in term-major, field-minor order, so callers add them exactly as the nested loop would.
+  if automaton is None:
+    return [weight for term in terms for field, weight in zip(fields, _LEXICAL_FIELD_WEIGHTS) if term in field]
+  # One scan over all fields; normalized text has no \x1f and terms never contain it, so no hit spans two fields.
+  starts: list[int] = []
+  offset = 0
+  for field in fields:
+    starts.append(offset)
+    offset += len(field) + 1
+  masks: dict[int, int] = {}
+  for end, (index, length) in automaton.iter("\x1f".join(fields)):
+    field_index = bisect.bisect_right(starts, end - length + 1) - 1
+    masks[index] = masks.get(index, 0) | (1 << field_index)
+  return [
+    weight
+    for index in sorted(masks)
+    for field_index, weight in enumerate(_LEXICAL_FIELD_WEIGHTS)
+    if masks[index] >> field_index & 1
+  ]
 
 
 def _entry_search_blob(entry: dict[str, Any]) -> str:
+  cached = entry.get("_blob")
+  if isinstance(cached, str):
+    return cached
   blob = _normalize_text(entry.get("_lexical_blob"), max_len=4000)
-  if blob:
-    return blob.lower()
-  return _build_lexical_blob(entry).lower()
+  search_blob = blob.lower() if blob else _build_lexical_blob(entry).lower()
+  entry["_blob"] = search_blob
+  return search_blob
 
 
 def _fts_match_query(terms: list[str]) -> str:
@@ -1051,11 +1568,17 @@ def _fts_match_query(terms: list[str]) -> str:
     safe_term = _normalize_term(term)
     if len(safe_term) < 2:
       continue
-    safe_term = re.sub(r"[^a-zа-я0-9_\-]+", "", safe_term, flags=re.IGNORECASE)
+    safe_term = _RE_FTS_CLEAN.sub("", safe_term)
     if not safe_term:
       continue
-    parts.append(f"{safe_term}*")
-  return " OR ".join(parts[:12])
+    if safe_term not in parts:
+      parts.append(safe_term)
+  # "term*" already matches every term it prefixes, so longer branches sharing that prefix are dropped.
+  collapsed = [
+    term for term in parts
+    if not any(other != term and term.startswith(other) for other in parts)
+  ]
+  return " OR ".join(f"{term}*" for term in collapsed[:12])
 
 
 def _search_fts_bonus_map(host: Any, base_terms: list[str], *, limit: int = 120) -> dict[str, float]:
@@ -1074,10 +1597,11 @@ def _search_fts_bonus_map(host: Any, base_terms: list[str], *, limit: int = 120)
     with lock:
       rows = conn.execute(
         f"""
-        SELECT id, bm25({SQL_FTS_TABLE}) AS rank
+        SELECT t.id AS id, bm25({SQL_FTS_TABLE}) AS rank
         FROM {SQL_FTS_TABLE}
+        JOIN {SQL_TABLE} AS t ON t.rowid = {SQL_FTS_TABLE}.rowid
         WHERE {SQL_FTS_TABLE} MATCH ?
-        ORDER BY rank
+        ORDER BY rank, t.updated_at DESC
         LIMIT ?
         """,
         (match_query, max(8, min(200, int(limit)))),
@@ -1137,6 +1661,7 @@ def remember(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
     tags = _merge_tags(tags, _default_tags_for_key(key))
 
   runtime_user_name = _normalize_text(getattr(runtime, "user_name", ""), max_len=96)
+  runtime_key = _make_user_key(runtime_user_name)
   runtime_chat_id = _normalize_text(getattr(runtime, "chat_id", ""), max_len=96)
   now = _now_utc_iso()
 
@@ -1144,16 +1669,17 @@ def remember(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
   target_index = -1
 
   fact_lc = fact.lower()
+  # Cached entries carry the lowered fact, so this is one string compare per entry.
   for index, entry in enumerate(entries):
-    if not _matches_scope(entry, scope="current_user", runtime_user_name=runtime_user_name):
+    if entry["_fact_lc"] != fact_lc:
       continue
-    if _normalize_text(entry.get("fact"), max_len=MAX_FACT_LEN).lower() == fact_lc:
+    if _matches_scope(entry, scope="current_user", runtime_key=runtime_key):
       target_index = index
       break
 
   if target_index < 0 and key and overwrite_key:
     for index, entry in enumerate(entries):
-      if not _matches_scope(entry, scope="current_user", runtime_user_name=runtime_user_name):
+      if not _matches_scope(entry, scope="current_user", runtime_key=runtime_key):
         continue
       if _canonicalize_key(entry.get("key")) == key:
         target_index = index
@@ -1173,6 +1699,7 @@ def remember(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
     existing["user_name"] = runtime_user_name or _normalize_text(existing.get("user_name"), max_len=96)
     if not _normalize_text(existing.get("created_at"), max_len=64):
       existing["created_at"] = now
+    _refresh_lexical_fields(existing)
     entries[target_index] = existing
     action = "updated"
     saved_entry = existing
@@ -1188,9 +1715,10 @@ def remember(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
       "chat_id": runtime_chat_id,
       "user_name": runtime_user_name,
     }
+    _refresh_lexical_fields(saved_entry)
     entries.append(saved_entry)
 
-  entries = _save_entries(host, entries)
+  entries = _save_changed_entry(host, entries, saved_entry)
   include_user = False
   return {
     "status": action,
@@ -1216,30 +1744,38 @@ def recall(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
     key = _infer_key_from_terms(base_query_terms + query_terms)
 
   runtime_user_name = _normalize_text(getattr(runtime, "user_name", ""), max_len=96)
+  runtime_key = _make_user_key(runtime_user_name)
   include_user = scope == "all"
-  entries = _load_entries(host)
+  entries = _load_entries_for_scope(host, scope=scope, runtime_user_name=runtime_user_name)
 
   fts_bonus_map = _search_fts_bonus_map(host, base_query_terms)
   query_vector = _build_sparse_vector(" ".join(query_terms if query_terms else base_query_terms))
+  query_norm = _vector_norm(query_vector)
+  semantic_scores = _semantic_scores(entries, query_vector, query_norm) if query_terms else {}
   query_lower = query.lower()
   now_ts = dt.datetime.now(dt.timezone.utc).timestamp()
 
+  query_tag_set = frozenset(tags)
+  term_automaton = _build_term_automaton(query_terms)
   ranked: list[tuple[float, float, dict[str, Any]]] = []
+  # Query matches wait for one batched fuzzy pass: (score so far, updated_ts, entry, matched otherwise).
+  pending: list[tuple[float, float, dict[str, Any], bool]] = []
+  fuzzy_targets: list[str] = []
   for entry in entries:
-    if not _matches_scope(entry, scope=scope, runtime_user_name=runtime_user_name):
+    if not _matches_scope(entry, scope=scope, runtime_key=runtime_key):
       continue
 
-    entry_key = _canonicalize_key(entry.get("key"))
-    entry_tags = _normalize_tags(entry.get("tags"))
+    entry_key = entry["_key_lc"]
+    searchable_tags = entry["_tags_lc"]
     if key and entry_key != key:
       continue
-    if tags and not set(tags).issubset(set(entry_tags)):
+    if query_tag_set and not query_tag_set.issubset(entry["_tag_set"]):
       continue
 
     entry_id = _normalize_text(entry.get("id"), max_len=120)
-    searchable_fact = _normalize_text(entry.get("fact"), max_len=MAX_FACT_LEN).lower()
-    searchable_key = entry_key.lower()
-    searchable_tags = [str(tag).lower() for tag in entry_tags]
+    searchable_fact = entry["_fact_lc"]
+    searchable_key = entry_key
+    searchable_tags_blob = entry["_tags_blob"]
     search_blob = _entry_search_blob(entry)
 
     score = float(int(entry.get("importance") or 3)) * 2.2
@@ -1249,45 +1785,58 @@ def recall(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
       score += 12.0
     score += float(fts_bonus_map.get(entry_id, 0.0))
 
-    updated_ts = _parse_iso(entry.get("updated_at")).timestamp()
+    updated_ts = entry["_updated_ts"]
     age_days = max(0.0, (now_ts - updated_ts) / 86400.0)
     score += max(0.0, 8.0 - min(8.0, age_days * 0.08))
 
     lexical_hits = 0
     if query_terms:
-      for term in query_terms:
-        if term in searchable_key:
-          score += 18.0
-          lexical_hits += 1
-        if term in searchable_fact:
-          score += 12.0
-          lexical_hits += 1
-        if any(term in tag for tag in searchable_tags):
-          score += 10.0
-          lexical_hits += 1
-        if term in search_blob:
-          score += 6.0
-          lexical_hits += 1
-
-      semantic_score = _cosine_similarity(query_vector, _entry_vector(entry))
-      score += semantic_score * 28.0
+      fields = (searchable_key, searchable_fact, searchable_tags_blob, search_blob)
+      for weight in _lexical_hit_weights(query_terms, term_automaton, fields):
+        score += weight
+        lexical_hits += 1
 
-      fuzzy_target = f"{searchable_fact} {searchable_key} {' '.join(searchable_tags)}".strip()
-      fuzzy_score = _fuzzy_similarity(query_lower, fuzzy_target)
-      score += fuzzy_score * 12.0
+      semantic_score = semantic_scores.get(entry_id, 0.0)
+      score += semantic_score * 28.0
 
       fts_bonus = float(fts_bonus_map.get(entry_id, 0.0))
-      if lexical_hits == 0 and semantic_score < 0.08 and fuzzy_score < 0.26 and fts_bonus <= 0.0:
-        continue
+      matched = lexical_hits > 0 or semantic_score >= 0.08 or fts_bonus > 0.0
+      pending.append((score, updated_ts, entry, matched))
+      fuzzy_targets.append(f"{searchable_fact} {searchable_key} {' '.join(searchable_tags)}".strip())
+      continue
 
     ranked.append((score, updated_ts, entry))
 
+  if pending:
+    fuzzy_query, fuzzy_targets = _fuzzy_operands(query_lower, fuzzy_targets)
+    # Upper bounds on the difflib ratio (1.0 without rapidfuzz) decide who still needs it:
+    # unmatched entries must be able to reach the 0.26 gate, and matched entries' partial
+    # scores are floors, so anything whose ceiling is below the limit-th floor cannot rank.
+    bounds = _fuzzy_upper_bounds(fuzzy_query, fuzzy_targets)
+    floor = -math.inf
+    if len(pending) > limit:
+      floors = heapq.nlargest(limit, (score for score, _ts, _entry, matched in pending if matched))
+      if len(floors) >= limit:
+        floor = floors[-1]
+    kept = [
+      index
+      for index, ((score, _ts, _entry, matched), bound) in enumerate(zip(pending, bounds))
+      if (matched or bound >= 0.26) and score + bound * 12.0 >= floor
+    ]
+    pending = [pending[index] for index in kept]
+    fuzzy_targets = [fuzzy_targets[index] for index in kept]
+    fuzzy_scores = _fuzzy_similarities(fuzzy_query, fuzzy_targets)
+    for (score, updated_ts, entry, matched), fuzzy_score in zip(pending, fuzzy_scores):
+      if not matched and fuzzy_score < 0.26:
+        continue
+      ranked.append((score + fuzzy_score * 12.0, updated_ts, entry))
+
   if query_terms or key or tags:
-    ranked.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    top = heapq.nlargest(limit, ranked, key=lambda item: (item[0], item[1]))
   else:
-    ranked.sort(key=lambda item: (item[1], item[0]), reverse=True)
+    top = heapq.nlargest(limit, ranked, key=lambda item: (item[1], item[0]))
 
-  selected = [item[2] for item in ranked[:limit]]
+  selected = [item[2] for item in top]
   memories = [_public_memory(entry, include_user=include_user) for entry in selected]
   results = [
     {
@@ -1324,12 +1873,13 @@ def list_memories(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, An
   offset = _safe_int(payload.get("offset"), fallback=0, min_value=0, max_value=2000)
 
   runtime_user_name = _normalize_text(getattr(runtime, "user_name", ""), max_len=96)
+  runtime_key = _make_user_key(runtime_user_name)
   include_user = scope == "all"
-  entries = _load_entries(host)
+  entries = _load_entries_for_scope(host, scope=scope, runtime_user_name=runtime_user_name)
 
   filtered = [
     entry for entry in entries
-    if _matches_scope(entry, scope=scope, runtime_user_name=runtime_user_name)
+    if _matches_scope(entry, scope=scope, runtime_key=runtime_key)
   ]
   filtered.sort(key=_entry_sort_key, reverse=True)
   total = len(filtered)
@@ -1378,18 +1928,19 @@ def forget(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
     raise ValueError("at least one of id, key, or query is required")
 
   runtime_user_name = _normalize_text(getattr(runtime, "user_name", ""), max_len=96)
+  runtime_key = _make_user_key(runtime_user_name)
   entries = _load_entries(host)
   kept: list[dict[str, Any]] = []
   removed: list[dict[str, Any]] = []
   include_user = scope == "all"
 
   for entry in entries:
-    if not _matches_scope(entry, scope=scope, runtime_user_name=runtime_user_name):
+    if not _matches_scope(entry, scope=scope, runtime_key=runtime_key):
       kept.append(entry)
       continue
 
     entry_id = _normalize_text(entry.get("id"), max_len=120)
-    entry_key = _canonicalize_key(entry.get("key"))
+    entry_key = entry["_key_lc"]
     search_blob = _entry_search_blob(entry)
 
     matches = False
@@ -3,6 +3,20 @@ from __future__ import annotations
 import re
 from typing import Any
 
+_RE_WS = re.compile(r"\s+")
+
+
+def _collapse_text_prefix(raw_text: str, max_chars: int) -> str:
+  # Collapsing only shrinks text, so a prefix that still overflows max_chars after
+  # collapsing yields the same first max_chars characters as the whole document.
+  window = max_chars * 2 + 64
+  while window < len(raw_text):
+    collapsed = _RE_WS.sub(" ", raw_text[:window]).lstrip()
+    if len(collapsed) > max_chars:
+      return collapsed
+    window *= 4
+  return _RE_WS.sub(" ", raw_text).strip()
+
 
 def handle(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
   payload = args or {}
@@ -15,7 +29,9 @@ def handle(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
   except (TypeError, ValueError):
     max_chars = 6000
   try:
-    max_links = int(payload.get("max_links") or 20)
+    raw_max_links = payload.get("max_links")
+    # An explicit 0 means "no links", so only a missing value falls back to the default.
+    max_links = 20 if raw_max_links is None or raw_max_links == "" else int(raw_max_links)
   except (TypeError, ValueError):
     max_links = 20
   safe_max_chars = max(400, min(40_000, max_chars))
@@ -27,13 +43,13 @@ def handle(args: dict[str, Any], runtime: Any, host: Any) -> dict[str, Any]:
   is_html = "html" in content_type
 
   title = host.extract_html_title(raw_text) if is_html else ""
-  content = host.html_to_text(raw_text) if is_html else re.sub(r"\s+", " ", raw_text).strip()
+  content = host.html_to_text(raw_text) if is_html else _collapse_text_prefix(raw_text, safe_max_chars)
   content = content[:safe_max_chars].strip()
   links = host.extract_html_links(
     raw_text,
     str(web_payload.get("url") or raw_url),
     limit=safe_max_links,
-  ) if is_html else []
+  ) if is_html and safe_max_links > 0 else []
 
   return {
     "requested_url": host.normalize_http_url(raw_url),